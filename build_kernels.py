@@ -0,0 +1,45 @@
+"""Compila antecipadamente (AOT) o kernel em lote de main.py.
+
+Uso:  python build_kernels.py
+
+Gera a extensão `foucault_kernels` ao lado de main.py, que a usa para rodar
+`integra_lote` quando o Numba não está instalado (com Numba, o JIT em cache
+continua preferido: ele roda os materiais em paralelo, e o pycc não suporta
+parallel=True). A extensão guarda a impressão de `main.impressao_kernels()`;
+se dtype, BLOCO, a paridade de Nx/Ny ou o código dos kernels mudarem, main.py
+a ignora até que seja recompilada.
+"""
+import os
+
+import numpy as np
+from numba.pycc import CC
+
+import main
+
+# ─── Assinaturas ──────────────────────────────────────────
+F  = f"f{np.dtype(main.dtype).itemsize}"
+A3 = f"{F}[:,:,::1]"
+A2 = f"{F}[:,::1]"
+A1 = f"{F}[::1]"
+I1 = "i8[::1]"
+
+ASSINATURA_LOTE = (
+    f"void({A3}, {A3}, {A3}, {A3}, {A3}, {A3}, {A1}, {A1}, {F}, {F}, "
+    f"{A1}, {A1}, {A1}, {A2}, {A2}, {I1}, {I1})"
+)
+
+
+def impressao():
+    """Impressão do kernel com que o módulo foi compilado."""
+    return IMPRESSAO
+
+
+IMPRESSAO = main.impressao_kernels()
+
+if __name__ == "__main__":
+    cc = CC("foucault_kernels")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export("integra_lote", ASSINATURA_LOTE)(main.integra_lote.py_func)
+    cc.export("impressao", "i8()")(impressao)
+    cc.compile()
+    print(f"  ✓ foucault_kernels compilado em {cc.output_dir}")
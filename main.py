@@ -1,8 +1,38 @@
+import argparse
+import hashlib
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
+from scipy.fft import dstn, idstn
+from scipy.linalg import solve_banded
 from scipy.ndimage import gaussian_filter
 
+try:
+    import numexpr as ne
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+try:
+    import cupy as cp
+    HAS_CUPY = True
+except ImportError:
+    HAS_CUPY = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    # Sem Numba os kernels continuam definidos (Python puro), mas o laço
+    # principal usa passo_numpy (com numexpr, se compensar: ver USA_NUMEXPR).
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
 # ─── Materiais ────────────────────────────────────────────
 materiais = {
     "Alumínio":  {"sigma": 3.5e7, "mu_r": 1.0,    "cor": "#3498db"},
@@ -18,59 +48,543 @@ mu0    = 4 * np.pi * 1e-7
 f      = 60.0
 omega  = 2 * np.pi * f
 B0     = 0.1
+dtype  = np.float32      # malha em precisão simples: metade do tráfego de memória
+BLOCO  = 32              # lado do bloco do stencil (cabe na L1)
+METODO = "explicito"     # "explicito" (Euler, dt limitado), "adi" ou "espectral"
+PASSOS_ADI = 200         # passos por período no ADI
+QUADROS_ESPECTRAL = 200  # amostras por período no espectral (o avanço é exato)
+GPU    = False           # Euler explícito em CUDA via CuPy (requer cupy)
+MIN_NUMEXPR = 256 * 256  # células do quadrante a partir das quais tentar numexpr
 x      = np.linspace(0, Lx, Nx)
 y      = np.linspace(0, Ly, Ny)
 xg     = np.linspace(0, Lx*100, Nx)
 yg     = np.linspace(0, Ly*100, Ny)
 
+# ─── Simetria ─────────────────────────────────────────────
+# Contorno e fonte são iguais nas quatro paredes, então Bz é simétrico em x e
+# em y: simula-se só o quadrante superior direito. A linha/coluna 0 do
+# quadrante é fantasma (espelho do interior, derivada normal nula) e a última
+# recebe o campo externo.
+nqx, nqy = Nx//2 + 1 + Nx % 2, Ny//2 + 1 + Ny % 2
+
+
+def aplica_contorno(Bz, b):
+    """Dirichlet nas paredes externas e espelho nas linhas de simetria."""
+    Bz[-1,:] = Bz[:,-1] = b
+    Bz[0,:]  = Bz[1 + Nx % 2,:]
+    Bz[:,0]  = Bz[:,1 + Ny % 2]
+
+
+def espelha(q, sx=1, sy=1):
+    """Malha Nx×Ny a partir do quadrante q; sx/sy: sinal das metades refletidas."""
+    q = q[1:,1:]
+    q = np.concatenate([sx * q[Nx % 2:][::-1], q], axis=0)
+    return np.concatenate([sy * q[:,Ny % 2:][:,::-1], q], axis=1)
+
+
+def espelha_hist(H):
+    """Histórico (passos, nqx) da coluna central -> (passos, Nx)."""
+    return np.concatenate([H[:,1 + Nx % 2:][:,::-1], H[:,1:]], axis=1)
+
+
+_aplica_contorno = njit(cache=True)(aplica_contorno)
+
+# ─── Kernel de difusão ────────────────────────────────────
+# Os escalares chegam no dtype da malha; constantes literais float64 ou
+# inteiras promoveriam o stencil inteiro para float64.
+@njit(fastmath=True, cache=True)
+def _J(Bz, i, j, kx, ky):
+    """(Jx, Jy) em (i,j) como np.gradient: diferença central, lateral nas bordas."""
+    nx, ny = Bz.shape
+    meio   = np.float32(0.5)
+    im, ip = max(i-1, 0), min(i+1, nx-1)
+    jm, jp = max(j-1, 0), min(j+1, ny-1)
+    sx = kx if ip - im == 1 else kx * meio
+    sy = ky if jp - jm == 1 else ky * meio
+    return -(Bz[i,jp] - Bz[i,jm]) * sy, (Bz[ip,j] - Bz[im,j]) * sx
+
+
+@njit(fastmath=True, cache=True)
+def _perdas_borda(Bz, losses, kx, ky, kp):
+    """Acumula kp·|J|² nas células da borda (diferenças laterais)."""
+    nx, ny = Bz.shape
+    for j in range(ny):
+        for i in (0, nx-1):
+            jx, jy = _J(Bz, i, j, kx, ky)
+            losses[i,j] += (jx*jx + jy*jy) * kp
+    for i in range(1, nx-1):
+        for j in (0, ny-1):
+            jx, jy = _J(Bz, i, j, kx, ky)
+            losses[i,j] += (jx*jx + jy*jy) * kp
+
+
+@njit(fastmath=True, cache=True)
+def _passo_linhas(Bz, Bz_new, losses, alpha, dt, invdx2, invdy2, src, kx, ky, kp, i0, i1):
+    """Corpo de `passo` nas linhas i0..i1-1 do interior, em blocos de BLOCO colunas."""
+    ny = Bz.shape[1]
+    hx, hy = kx * np.float32(0.5), ky * np.float32(0.5)
+    for jj in range(1, ny-1, BLOCO):
+        for i in range(i0, i1):
+            for j in range(jj, min(jj + BLOCO, ny-1)):
+                jx = -(Bz[i,j+1] - Bz[i,j-1]) * hy
+                jy =  (Bz[i+1,j] - Bz[i-1,j]) * hx
+                losses[i,j] += (jx*jx + jy*jy) * kp
+                c2  = Bz[i,j] + Bz[i,j]
+                lap = (
+                    (Bz[i+1,j] + Bz[i-1,j] - c2) * invdx2 +
+                    (Bz[i,j+1] + Bz[i,j-1] - c2) * invdy2
+                )
+                Bz_new[i,j] = Bz[i,j] + dt * (alpha * lap + src)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def passo(Bz, Bz_new, losses, alpha, dt, invdx2, invdy2, src, kx, ky, kp):
+    """Avança o interior de Bz um passo (Euler explícito, stencil de 5 pontos) em Bz_new.
+
+    Na mesma passada acumula em `losses` a perda Joule kp·|J|² do estado de
+    entrada, com kx = 1/(dx·μ), ky = 1/(dy·μ) e kp = dt/σ. O interior é
+    percorrido em blocos BLOCO×BLOCO, paralelos por faixa de linhas.
+    """
+    nx = Bz.shape[0]
+    _perdas_borda(Bz, losses, kx, ky, kp)
+    for bi in prange((nx - 2 + BLOCO - 1) // BLOCO):
+        ii = 1 + bi * BLOCO
+        _passo_linhas(Bz, Bz_new, losses, alpha, dt, invdx2, invdy2, src,
+                      kx, ky, kp, ii, min(ii + BLOCO, nx-1))
+
+
+@njit(cache=True)
+def calcula_J(Bz, Jx, Jy, kx, ky):
+    """Preenche Jx, Jy com a densidade de corrente de Bz (usado no snapshot)."""
+    nx, ny = Bz.shape
+    for i in range(nx):
+        for j in range(ny):
+            Jx[i,j], Jy[i,j] = _J(Bz, i, j, kx, ky)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def integra_lote(Bz, Bz_new, losses, Bz_hist, snap_Jx, snap_Jy, alpha, dt,
+                 invdx2, invdy2, kx, ky, kp, cos_src, bext, n_steps, snap_step):
+    """Euler explícito de vários materiais de uma vez, um por thread.
+
+    O eixo 0 de cada array é o material; as tabelas de fonte/contorno e o
+    histórico vão até o maior n_steps. Cada material repete, em série, o laço
+    de `integra_explicito`.
+    """
+    nx = Bz.shape[1]
+    for k in prange(Bz.shape[0]):
+        b, b_new = Bz[k], Bz_new[k]
+        for step in range(n_steps[k]):
+            _perdas_borda(b, losses[k], kx[k], ky[k], kp[k])
+            for ii in range(1, nx-1, BLOCO):
+                _passo_linhas(b, b_new, losses[k], alpha[k], dt[k], invdx2, invdy2,
+                              cos_src[k, step], kx[k], ky[k], kp[k], ii, min(ii + BLOCO, nx-1))
+            b, b_new = b_new, b
+            _aplica_contorno(b, bext[k, step])
+            Bz_hist[k, step] = b[:, 1]
+            if step == snap_step[k]:
+                calcula_J(b, snap_Jx[k], snap_Jy[k], kx[k], ky[k])
+        # Perda do estado final (b_new é só rascunho aqui)
+        _perdas_borda(b, losses[k], kx[k], ky[k], kp[k])
+        _passo_linhas(b, b_new, losses[k], alpha[k], dt[k], invdx2, invdy2,
+                      np.float32(0.0), kx[k], ky[k], kp[k], 1, nx-1)
+
+
+def impressao_kernels():
+    """Inteiro que identifica `integra_lote` como compilado.
+
+    Cobre o dtype, BLOCO, a paridade da malha e o código-fonte do kernel e das
+    funções que ele chama; build_kernels.py grava o valor na extensão AOT.
+    """
+    fontes = "".join(
+        inspect.getsource(getattr(fn, "py_func", fn))
+        for fn in (integra_lote, _passo_linhas, _perdas_borda, _J, calcula_J, aplica_contorno)
+    )
+    chave = repr((np.dtype(dtype).name, BLOCO, Nx % 2, Ny % 2, fontes))
+    return int(hashlib.md5(chave.encode()).hexdigest()[:15], 16)
+
+
+# Sem Numba, usa a versão pré-compilada de `integra_lote` (python build_kernels.py)
+# se ela tiver sido gerada a partir deste mesmo kernel; o pycc não confere os
+# tipos dos argumentos, então uma extensão desatualizada não pode ser chamada.
+_integra_lote_aot = None
+if not HAS_NUMBA:
+    try:
+        from foucault_kernels import integra_lote as _aot, impressao as _impressao_aot
+        if _impressao_aot() == impressao_kernels():
+            _integra_lote_aot = _aot
+        else:
+            print("  ! foucault_kernels desatualizado (rode python build_kernels.py); ignorado")
+    except ImportError:
+        pass
+
+
+# Em um só núcleo o numexpr perde para os ufuncs com out= (passo_numpy em
+# float32: 72 vs 53 µs no quadrante 51², 2,7 vs 2,0 ms em 501²); ele só pode
+# compensar repartindo malhas grandes entre threads.
+USA_NUMEXPR = HAS_NUMEXPR and ne.detect_number_of_cores() > 1 and nqx * nqy >= MIN_NUMEXPR
+
+
+def calcula_J_numpy(Bz, Jx, Jy, kx, ky):
+    """Versão NumPy de `calcula_J`: as mesmas diferenças de np.gradient, por fatias."""
+    np.subtract(Bz[:,2:], Bz[:,:-2], out=Jx[:,1:-1])
+    np.subtract(Bz[:,1], Bz[:,0], out=Jx[:,0])
+    np.subtract(Bz[:,-1], Bz[:,-2], out=Jx[:,-1])
+    Jx[:,1:-1] *= -0.5 * ky
+    Jx[:,[0,-1]] *= -ky
+    np.subtract(Bz[2:,:], Bz[:-2,:], out=Jy[1:-1,:])
+    np.subtract(Bz[1,:], Bz[0,:], out=Jy[0,:])
+    np.subtract(Bz[-1,:], Bz[-2,:], out=Jy[-1,:])
+    Jy[1:-1,:] *= 0.5 * kx
+    Jy[[0,-1],:] *= kx
+
+
+def perdas_numpy(Bz, losses, Jx, Jy, kx, ky, kp):
+    """Acumula em `losses` a perda Joule kp·|J|² de Bz; Jx, Jy são rascunho."""
+    calcula_J_numpy(Bz, Jx, Jy, kx, ky)
+    if USA_NUMEXPR:
+        ne.evaluate("losses + (Jx*Jx + Jy*Jy) * kp", out=losses)
+        return
+    np.multiply(Jx, Jx, out=Jx)
+    np.multiply(Jy, Jy, out=Jy)
+    Jx += Jy
+    Jx *= kp
+    losses += Jx
+
+
+def passo_numpy(Bz, Bz_new, losses, lap, tmp, alpha, dt, invdx2, invdy2, src, kx, ky, kp):
+    """Versão NumPy de `passo`, sem temporários: tudo em `lap` e `tmp` pré-alocados.
+
+    Com numexpr (USA_NUMEXPR) o stencil inteiro vira uma única expressão
+    avaliada em blocos, sem passar pelos buffers.
+    """
+    perdas_numpy(Bz, losses, lap, tmp, kx, ky, kp)
+    c = Bz[1:-1,1:-1]
+    if USA_NUMEXPR:
+        ne.evaluate(
+            "c + dt*(alpha*((xp + xm - 2*c)*invdx2 + (yp + ym - 2*c)*invdy2) + src)",
+            local_dict=dict(c=c, xp=Bz[2:,1:-1], xm=Bz[:-2,1:-1],
+                            yp=Bz[1:-1,2:], ym=Bz[1:-1,:-2], alpha=alpha, dt=dt,
+                            invdx2=invdx2, invdy2=invdy2, src=src),
+            out=Bz_new[1:-1,1:-1])
+        return
+    L = lap[1:-1,1:-1]
+    t = tmp[1:-1,1:-1]
+    np.add(Bz[2:,1:-1], Bz[:-2,1:-1], out=L)
+    L -= c
+    L -= c
+    L *= invdx2
+    np.add(Bz[1:-1,2:], Bz[1:-1,:-2], out=t)
+    t -= c
+    t -= c
+    t *= invdy2
+    L += t
+    L *= dt * alpha
+    L += dt * src
+    np.add(c, L, out=Bz_new[1:-1,1:-1])
+
+# ─── Kernel CUDA (CuPy) ───────────────────────────────────
+# Mesmo passo de `passo`: cada bloco 32×8 carrega seu ladrilho com halo em
+# memória compartilhada; índices fora da malha são rebatidos para a borda.
+_PASSO_CUDA = r"""
+#define BX 32
+#define BY 8
+extern "C" __global__
+void passo_gpu(const float* Bz, float* Bz_new, float* losses,
+               const int nx, const int ny,
+               const float alpha, const float dt,
+               const float invdx2, const float invdy2, const float src,
+               const float kx, const float ky, const float kp)
+{
+    __shared__ float s[BY + 2][BX + 2];
+    const int j  = blockIdx.x * BX + threadIdx.x;
+    const int i  = blockIdx.y * BY + threadIdx.y;
+    const int tj = threadIdx.x + 1;
+    const int ti = threadIdx.y + 1;
+    const int ic = min(i, nx - 1);
+    const int jc = min(j, ny - 1);
+
+    s[ti][tj] = Bz[ic * ny + jc];
+    if (threadIdx.x == 0)      s[ti][0]      = Bz[ic * ny + max(jc - 1, 0)];
+    if (threadIdx.x == BX - 1) s[ti][BX + 1] = Bz[ic * ny + min(jc + 1, ny - 1)];
+    if (threadIdx.y == 0)      s[0][tj]      = Bz[max(ic - 1, 0) * ny + jc];
+    if (threadIdx.y == BY - 1) s[BY + 1][tj] = Bz[min(ic + 1, nx - 1) * ny + jc];
+    __syncthreads();
+    if (i >= nx || j >= ny) return;
+
+    // |J|² como np.gradient: central no interior, lateral nas bordas
+    const int im = max(i - 1, 0), ip = min(i + 1, nx - 1);
+    const int jm = max(j - 1, 0), jp = min(j + 1, ny - 1);
+    const float sx = (ip - im == 2) ? 0.5f * kx : kx;
+    const float sy = (jp - jm == 2) ? 0.5f * ky : ky;
+    const float jx = -(s[ti][tj + jp - j] - s[ti][tj + jm - j]) * sy;
+    const float jy =  (s[ti + ip - i][tj] - s[ti + im - i][tj]) * sx;
+    losses[i * ny + j] += (jx * jx + jy * jy) * kp;
+
+    if (i > 0 && i < nx - 1 && j > 0 && j < ny - 1) {
+        const float c   = s[ti][tj];
+        const float c2  = c + c;
+        const float lap = (s[ti + 1][tj] + s[ti - 1][tj] - c2) * invdx2
+                        + (s[ti][tj + 1] + s[ti][tj - 1] - c2) * invdy2;
+        Bz_new[i * ny + j] = c + dt * (alpha * lap + src);
+    }
+}
+"""
+BLOCO_GPU = (32, 8)
+
+if HAS_CUPY:
+    _passo_gpu = cp.RawKernel(_PASSO_CUDA, "passo_gpu")
+
+
+# ─── Peaceman–Rachford (ADI) ──────────────────────────────
+def _banda(m, r, paridade):
+    """Matriz tridiagonal (1+2r, -r) de ordem m no formato de solve_banded.
+
+    A primeira incógnita é vizinha da célula fantasma, que espelha a própria
+    incógnita (paridade 0) ou a seguinte (paridade 1).
+    """
+    ab = np.empty((3, m))
+    ab[0], ab[1], ab[2] = -r, 1 + 2*r, -r
+    ab[0, 0] = ab[2, -1] = 0.0
+    if paridade == 0:
+        ab[1, 0] = 1 + r
+    else:
+        ab[0, 1] = -2 * r
+    return ab
+
+
+# ─── Integração no tempo ──────────────────────────────────
+def integra_explicito(alpha, mu, sigma, dt, n_steps):
+    """Euler explícito no quadrante; devolve (losses, Bz_hist, snap_Jx, snap_Jy)."""
+    Bz      = np.zeros((nqx, nqy), dtype=dtype)
+    Bz_new  = np.zeros((nqx, nqy), dtype=dtype)
+    lap     = np.empty_like(Bz)                      # rascunho do caminho NumPy
+    tmp     = np.empty_like(Bz)
+    losses  = np.zeros((nqx, nqy), dtype=dtype)
+    Bz_hist = np.empty((n_steps, nqx), dtype=dtype)   # uma linha contígua por passo
+    snap_Jx = np.zeros((nqx, nqy), dtype=dtype)
+    snap_Jy = np.zeros((nqx, nqy), dtype=dtype)
+
+    # Escalares dos kernels no dtype da malha
+    a_k, dt_k  = dtype(alpha), dtype(dt)
+    invdx2, invdy2 = dtype(1.0 / dx**2), dtype(1.0 / dy**2)
+    kx, ky, kp     = dtype(1.0 / (dx * mu)), dtype(1.0 / (dy * mu)), dtype(dt / sigma)
+
+    # Fonte e campo externo do período inteiro tabelados de uma vez
+    phases  = omega * np.arange(n_steps) * dt
+    cos_src = (B0 * omega * np.cos(phases)).astype(dtype)
+    bext    = (B0 * np.sin(phases)).astype(dtype)
+    # Snapshot de J no primeiro passo com |ωt - π/2| < 2ωdt (pico do campo externo)
+    snap_step = max(int(np.floor((np.pi/2) / (omega * dt))) - 1, 0)
+
+    for step in range(n_steps):
+        src = cos_src[step]
+        if HAS_NUMBA:
+            passo(Bz, Bz_new, losses, a_k, dt_k, invdx2, invdy2, src, kx, ky, kp)
+        else:
+            passo_numpy(Bz, Bz_new, losses, lap, tmp, a_k, dt_k, invdx2, invdy2, src, kx, ky, kp)
+        Bz, Bz_new = Bz_new, Bz
+        aplica_contorno(Bz, bext[step])
+        Bz_hist[step] = Bz[:, 1]
+
+        if step == snap_step:
+            (calcula_J if HAS_NUMBA else calcula_J_numpy)(Bz, snap_Jx, snap_Jy, kx, ky)
+
+    # `passo` acumula a perda do estado de entrada; falta a do estado final
+    perdas_numpy(Bz, losses, lap, tmp, kx, ky, kp)
+    return losses, Bz_hist, snap_Jx, snap_Jy
+
+
+def integra_gpu(alpha, mu, sigma, dt, n_steps):
+    """Euler explícito na GPU; mesmo esquema e saída de `integra_explicito`.
+
+    Roda no stream corrente, então chamadas em threads diferentes (uma por
+    material, cada uma com seu stream) se sobrepõem na GPU.
+    """
+    Bz      = cp.zeros((nqx, nqy), dtype=cp.float32)
+    Bz_new  = cp.zeros((nqx, nqy), dtype=cp.float32)
+    losses  = cp.zeros((nqx, nqy), dtype=cp.float32)
+    Bz_hist = cp.empty((n_steps, nqx), dtype=cp.float32)
+    snap_Jx = np.zeros((nqx, nqy), dtype=np.float32)
+    snap_Jy = np.zeros((nqx, nqy), dtype=np.float32)
+
+    f32 = np.float32
+    args = (np.int32(nqx), np.int32(nqy), f32(alpha), f32(dt),
+            f32(1.0 / dx**2), f32(1.0 / dy**2))
+    kx, ky, kp = f32(1.0 / (dx * mu)), f32(1.0 / (dy * mu)), f32(dt / sigma)
+    bx, by = BLOCO_GPU
+    grade  = ((nqy + bx - 1) // bx, (nqx + by - 1) // by)
+
+    phases  = omega * np.arange(n_steps) * dt
+    cos_src = (B0 * omega * np.cos(phases)).astype(np.float32)
+    bext    = (B0 * np.sin(phases)).astype(np.float32)
+    snap_step = max(int(np.floor((np.pi/2) / (omega * dt))) - 1, 0)
+
+    for step in range(n_steps):
+        _passo_gpu(grade, BLOCO_GPU,
+                   (Bz, Bz_new, losses) + args + (cos_src[step], kx, ky, kp))
+        Bz, Bz_new = Bz_new, Bz
+        aplica_contorno(Bz, bext[step])
+        Bz_hist[step] = Bz[:, 1]
+        if step == snap_step:
+            calcula_J_numpy(cp.asnumpy(Bz), snap_Jx, snap_Jy, kx, ky)
+
+    # Mais uma passada só para somar a perda do estado final (Bz_new é descartado)
+    _passo_gpu(grade, BLOCO_GPU,
+               (Bz, Bz_new, losses) + args + (f32(0.0), kx, ky, kp))
+    return cp.asnumpy(losses), cp.asnumpy(Bz_hist), snap_Jx, snap_Jy
+
+
+def integra_adi(alpha, mu, sigma, dt, n_steps):
+    """Peaceman–Rachford: meio passo implícito em x, meio passo implícito em y.
+
+    Incondicionalmente estável, então dt só precisa resolver a senoide. Cada
+    meio passo resolve um sistema tridiagonal por linha (ou coluna) do interior,
+    todos de uma vez com solve_banded. Devolve o mesmo que `integra_explicito`.
+    """
+    Bz      = np.zeros((nqx, nqy), dtype=dtype)
+    Bs      = np.zeros((nqx, nqy), dtype=dtype)     # estado no meio passo
+    Jx, Jy  = np.empty_like(Bz), np.empty_like(Bz)  # rascunho das perdas
+    losses  = np.zeros((nqx, nqy), dtype=dtype)
+    Bz_hist = np.empty((n_steps, nqx), dtype=dtype)
+    snap_Jx = np.zeros((nqx, nqy), dtype=dtype)
+    snap_Jy = np.zeros((nqx, nqy), dtype=dtype)
+
+    rx, ry   = alpha * dt / (2 * dx**2), alpha * dt / (2 * dy**2)
+    ab_x     = _banda(nqx - 2, rx, Nx % 2)
+    ab_y     = _banda(nqy - 2, ry, Ny % 2)
+    kx, ky, kp = dtype(1.0 / (dx * mu)), dtype(1.0 / (dy * mu)), dtype(dt / sigma)
+
+    # Fonte no ponto médio de cada passo; contorno no meio e no fim do passo
+    t_meio = (np.arange(n_steps) + 0.5) * dt
+    fonte  = dt / 2 * B0 * omega * np.cos(omega * t_meio)
+    b_meio = B0 * np.sin(omega * t_meio)
+    b_fim  = B0 * np.sin(omega * (np.arange(n_steps) + 1) * dt)
+    # O estado após o passo k está em t = (k+1)·dt; snapshot em ωt ≈ π/2
+    snap_step = max(int(round((np.pi/2) / (omega * dt))) - 1, 0)
+
+    for step in range(n_steps):
+        # Meio passo 1: implícito em x, explícito em y
+        c   = Bz[1:-1,1:-1]
+        rhs = c + ry * (Bz[1:-1,2:] - 2*c + Bz[1:-1,:-2]) + fonte[step]
+        rhs[-1,:] += rx * b_meio[step]
+        Bs[1:-1,1:-1] = solve_banded((1, 1), ab_x, rhs, check_finite=False)
+        aplica_contorno(Bs, b_meio[step])
+
+        # Meio passo 2: implícito em y, explícito em x
+        c   = Bs[1:-1,1:-1]
+        rhs = c + rx * (Bs[2:,1:-1] - 2*c + Bs[:-2,1:-1]) + fonte[step]
+        rhs[:,-1] += ry * b_fim[step]
+        Bz[1:-1,1:-1] = solve_banded((1, 1), ab_y, rhs.T, check_finite=False).T
+        aplica_contorno(Bz, b_fim[step])
+
+        perdas_numpy(Bz, losses, Jx, Jy, kx, ky, kp)
+        Bz_hist[step] = Bz[:, 1]
+        if step == snap_step:
+            calcula_J_numpy(Bz, snap_Jx, snap_Jy, kx, ky)
+
+    return losses, Bz_hist, snap_Jx, snap_Jy
+
+
+def integra_espectral(alpha, mu, sigma, dt, n_steps):
+    """Avanço exato no tempo do sistema semi-discreto, na base de senos (DST-I).
+
+    Com Bz = Bext(t) + u, u se anula na borda e cada modo do laplaciano
+    discreto com Dirichlet evolui sozinho: decai com exp(-αλ·dt) e recebe a
+    parte harmônica do forçamento por Duhamel. O avanço vale para qualquer dt;
+    os n_steps quadros só amostram histórico, perdas e snapshot. Resolve a
+    malha inteira e devolve o quadrante, como os demais integradores.
+    """
+    mx, my = Nx - 2, Ny - 2
+    lam = (
+        (4 * np.sin(np.pi * np.arange(1, mx+1) / (2 * (mx+1)))**2 / dx**2)[:, None] +
+        (4 * np.sin(np.pi * np.arange(1, my+1) / (2 * (my+1)))**2 / dy**2)[None, :]
+    )
+    a     = alpha * lam
+    decai = np.exp(-a * dt)
+    # Forçamento de u (uniforme no interior) = fonte - dBext/dt, em fasores de
+    # e^{iωt}: fonte B0·ω·cos(ωt) -> B0·ω; Bext = B0·sin(ωt) -> -i·B0. Com a
+    # fonte deste modelo as duas parcelas coincidem e u fica em zero.
+    fonte    = B0 * omega
+    bext     = -1j * B0
+    G        = fonte - 1j * omega * bext
+    perfil   = G * dstn(np.ones((mx, my)), type=1, norm="ortho")
+    resposta = (np.exp(1j * omega * dt) - decai) / (a + 1j * omega)   # ∫₀^dt e^{-a(dt-s)} e^{iωs} ds
+
+    u_hat   = np.zeros((mx, my))
+    Bz      = np.empty((Nx, Ny), dtype=dtype)
+    q       = Bz[Nx//2 - 1:, Ny//2 - 1:]                 # quadrante (com fantasma)
+    losses  = np.zeros((nqx, nqy), dtype=dtype)
+    Jx, Jy  = np.empty_like(losses), np.empty_like(losses)
+    Bz_hist = np.empty((n_steps, nqx), dtype=dtype)
+    snap_Jx = np.zeros((nqx, nqy), dtype=dtype)
+    snap_Jy = np.zeros((nqx, nqy), dtype=dtype)
+    kx, ky, kp = dtype(1.0 / (dx * mu)), dtype(1.0 / (dy * mu)), dtype(dt / sigma)
+    snap_step  = max(int(round((np.pi/2) / (omega * dt))) - 1, 0)
+
+    for step in range(n_steps):
+        t     = step * dt
+        u_hat = decai * u_hat + np.real(perfil * np.exp(1j * omega * t) * resposta)
+        Bz[:] = B0 * np.sin(omega * (t + dt))
+        Bz[1:-1,1:-1] += idstn(u_hat, type=1, norm="ortho")
+
+        perdas_numpy(q, losses, Jx, Jy, kx, ky, kp)
+        Bz_hist[step] = q[:, 1]
+        if step == snap_step:
+            calcula_J_numpy(q, snap_Jx, snap_Jy, kx, ky)
+
+    return losses, Bz_hist, snap_Jx, snap_Jy
+
+
 # ─── Simulação por material ───────────────────────────────
-resultados = {}
+# METODO -> (integrador, passos por período). None: dt no limite de
+# estabilidade do Euler explícito, que também decide entre CPU e GPU.
+METODOS = {
+    "explicito": (integra_explicito, None),
+    "adi":       (integra_adi,       PASSOS_ADI),
+    "espectral": (integra_espectral, QUADROS_ESPECTRAL),
+}
+
 
-for nome, props in materiais.items():
+def discretiza(props):
+    """(mu, sigma, alpha, dt, n_steps) do material para o METODO escolhido."""
     sigma = props["sigma"]
     mu    = mu0 * props["mu_r"]
     alpha = 1.0 / (mu * sigma)
-    dt    = 0.2 * mu * sigma * min(dx, dy)**2
     T     = 1.0 / f
-    n_steps = int(T / dt)
+    _, passos = METODOS[METODO]
+    if passos is None:
+        dt      = 0.2 * mu * sigma * min(dx, dy)**2
+        n_steps = int(T / dt)
+    else:
+        n_steps = passos
+        dt      = T / n_steps
+    return mu, sigma, alpha, dt, n_steps
 
-    Bz      = np.zeros((Nx, Ny))
-    losses  = np.zeros((Nx, Ny))
-    Bz_hist = np.zeros((Nx, n_steps))
-    snap_Jx = snap_Jy = None
-    snap_ok = False
-    t = 0.0
 
-    for step in range(n_steps):
-        phase = omega * t
-        lap = (
-            (np.roll(Bz,-1,0) + np.roll(Bz,1,0) - 2*Bz) / dx**2 +
-            (np.roll(Bz,-1,1) + np.roll(Bz,1,1) - 2*Bz) / dy**2
-        )
-        Bz += dt * (alpha * lap + B0 * omega * np.cos(phase))
-        Bext = B0 * np.sin(phase)
-        Bz[0,:] = Bz[-1,:] = Bz[:,0] = Bz[:,-1] = Bext
-
-        Jx = -np.gradient(Bz, dy, axis=1) / mu
-        Jy =  np.gradient(Bz, dx, axis=0) / mu
-        losses += (Jx**2 + Jy**2) * dt / sigma
-        Bz_hist[:, step] = Bz[:, Ny//2]
-
-        if not snap_ok and abs((phase % (2*np.pi)) - np.pi/2) < omega*dt*2:
-            snap_Jx, snap_Jy = Jx.copy(), Jy.copy()
-            snap_ok = True
-        t += dt
-
-    losses_avg = losses / T
-    J_mag      = np.sqrt(snap_Jx**2 + snap_Jy**2) / 1e6
-    Bz_perfil  = (Bz_hist.max(axis=1) - Bz_hist.min(axis=1)) / 2 * 1000
+def grandezas(nome, props, dt, n_steps, losses, Bz_hist, snap_Jx, snap_Jy):
+    """Grandezas derivadas da simulação (no quadrante) de um material."""
+    sigma = props["sigma"]
+    mu    = mu0 * props["mu_r"]
+    T     = 1.0 / f
+
+    # Quadrante -> malha inteira (Jx é ímpar em y, Jy é ímpar em x)
+    losses  = espelha(losses)
+    Bz_hist = espelha_hist(Bz_hist)
+    snap_Jx = espelha(snap_Jx, sy=-1)
+    snap_Jy = espelha(snap_Jy, sx=-1)
+
+    losses_avg = losses.astype(np.float64) / T
+    J_mag      = np.hypot(snap_Jx, snap_Jy).astype(np.float64) / 1e6
+    Bz_perfil  = (Bz_hist.max(axis=0) - Bz_hist.min(axis=0)) / 2 * 1000
     delta      = np.sqrt(2 / (omega * mu * sigma))
     phi_lag    = (Lx/4) / delta
     lag_ms     = phi_lag / omega * 1000
     espessura  = 0.01
     P_total    = losses_avg.mean() * Lx * Ly * espessura
 
-    resultados[nome] = {
+    print(f"  ✓ {nome} simulado  ({n_steps} passos, dt={dt*1e6:.3f} μs)")
+    return {
         "delta":      delta,
         "lag_ms":     lag_ms,
         "phi_lag":    phi_lag,
@@ -89,136 +603,287 @@ for nome, props in materiais.items():
         "mu_r":       props["mu_r"],
         "n_steps":    n_steps,
     }
-    print(f"  ✓ {nome} simulado  ({n_steps} passos, dt={dt*1e6:.3f} μs)")
 
-# ─── CLI ──────────────────────────────────────────────────
-print("\n" + "=" * 62)
-print("  COMPARAÇÃO DE MATERIAIS — CORRENTES DE FOUCAULT (60 Hz)")
-print("=" * 62)
-hdr = f"  {'Grandeza':<28} {'Alumínio':>10} {'Cobre':>10} {'Ferro':>10}"
-print(hdr)
-print("  " + "-" * 60)
-
-linhas = [
-    ("Condutividade [S/m]",  "sigma",   "{:.2e}"),
-    ("Permeabilidade (μᵣ)",  "mu_r",    "{:.0f}"),
-    ("Skin depth δ [mm]",    "delta",   "{:.2f}",   1000),
-    ("Defasagem [ms]",       "lag_ms",  "{:.3f}"),
-    ("Defasagem [°]",        "phi_lag", "{:.1f}",   180/np.pi),
-    ("|J| máximo [kA/m²]",  "J_max",   "{:.2f}",   1e3),
-    ("|J| médio [kA/m²]",   "J_mean",  "{:.2f}",   1e3),
-    ("Razão pico/média",     None,      "{:.2f}"),
-    ("P máxima [kW/m³]",    "P_max",   "{:.4f}",   1e-3),
-    ("P média [kW/m³]",     "P_mean",  "{:.4f}",   1e-3),
-    ("P total [mW]",         "P_total", "{:.4f}",   1e3),
-]
-
-for linha in linhas:
-    label = linha[0]
-    key   = linha[1]
-    fmt   = linha[2]
-    scale = linha[3] if len(linha) > 3 else 1.0
-
-    vals = []
-    for nome in materiais:
-        r = resultados[nome]
-        if key is None:
-            v = r["J_max"] / r["J_mean"]
-        else:
-            v = r[key] * scale
-        vals.append(fmt.format(v))
 
-    print(f"  {label:<28} {vals[0]:>10} {vals[1]:>10} {vals[2]:>10}")
+def simular(nome, props):
+    """Simula um período da excitação em um material e devolve suas grandezas."""
+    mu, sigma, alpha, dt, n_steps = discretiza(props)
+    integra, _ = METODOS[METODO]
+    if integra is integra_explicito and GPU:
+        integra = integra_gpu
+
+    if integra is integra_gpu:
+        with cp.cuda.Stream(non_blocking=True) as stream:
+            campos = integra(alpha, mu, sigma, dt, n_steps)
+            stream.synchronize()
+    else:
+        campos = integra(alpha, mu, sigma, dt, n_steps)
+    return grandezas(nome, props, dt, n_steps, *campos)
+
+
+def simular_lote(materiais):
+    """Euler explícito de todos os materiais num só kernel (`integra_lote`).
+
+    Sem Numba, usa a versão AOT de build_kernels.py.
+    """
+    nomes = list(materiais)
+    disc  = [discretiza(materiais[n]) for n in nomes]
+    mu, sigma, alpha, dt, n_steps = (np.array(v) for v in zip(*disc))
+    nm, n_max = len(nomes), int(n_steps.max())
+
+    Bz      = np.zeros((nm, nqx, nqy), dtype=dtype)
+    Bz_new  = np.zeros_like(Bz)
+    losses  = np.zeros_like(Bz)
+    snap_Jx = np.zeros_like(Bz)
+    snap_Jy = np.zeros_like(Bz)
+    Bz_hist = np.empty((nm, n_max, nqx), dtype=dtype)
+
+    # Mesmas tabelas e escalares de `integra_explicito`, uma linha por material
+    phases  = omega * np.arange(n_max) * dt[:, None]
+    cos_src = (B0 * omega * np.cos(phases)).astype(dtype)
+    bext    = (B0 * np.sin(phases)).astype(dtype)
+    snap_step = np.maximum(np.floor((np.pi/2) / (omega * dt)).astype(np.int64) - 1, 0)
+
+    kernel = integra_lote if HAS_NUMBA else _integra_lote_aot
+    kernel(Bz, Bz_new, losses, Bz_hist, snap_Jx, snap_Jy,
+           alpha.astype(dtype), dt.astype(dtype),
+           dtype(1.0 / dx**2), dtype(1.0 / dy**2),
+           (1.0 / (dx * mu)).astype(dtype), (1.0 / (dy * mu)).astype(dtype),
+           (dt / sigma).astype(dtype), cos_src, bext,
+           n_steps.astype(np.int64), snap_step)
+
+    return {
+        nome: grandezas(nome, materiais[nome], dt[k], n_steps[k], losses[k],
+                        Bz_hist[k, :n_steps[k]], snap_Jx[k], snap_Jy[k])
+        for k, nome in enumerate(nomes)
+    }
+
+
+# ─── Cache de resultados ──────────────────────────────────
+def caminho_cache():
+    """foucault_<hash>.npz, com o hash de tudo que determina a simulação.
+
+    Inclui o código deste arquivo: editar a física ou o pós-processamento
+    invalida o cache, não só mudar os parâmetros.
+    """
+    chave = repr((f, B0, Lx, Ly, Nx, Ny, np.dtype(dtype).name, METODO,
+                  PASSOS_ADI, QUADROS_ESPECTRAL, GPU, sorted(materiais.items())))
+    with open(__file__, "rb") as fonte:
+        codigo = fonte.read()
+    return f"foucault_{hashlib.md5(chave.encode() + codigo).hexdigest()[:8]}.npz"
+
+
+def finitos(resultados):
+    """Se todas as grandezas numéricas de `resultados` são finitas."""
+    return all(
+        np.isfinite(valor).all()
+        for r in resultados.values()
+        for valor in r.values()
+        if not isinstance(valor, str)
+    )
+
+
+def salva_cache(caminho, resultados):
+    """Grava `resultados` achatado: chave "<material>/<grandeza>"."""
+    planos = {
+        f"{nome}/{chave}": valor
+        for nome, r in resultados.items()
+        for chave, valor in r.items()
+    }
+    np.savez_compressed(caminho, **planos)
+
+
+def carrega_cache(caminho):
+    """Inverso de `salva_cache`; escalares voltam como tipos Python."""
+    resultados = {nome: {} for nome in materiais}
+    with np.load(caminho) as dados:
+        for chave in dados.files:
+            nome, grandeza = chave.split("/", 1)
+            valor = dados[chave]
+            resultados[nome][grandeza] = valor.item() if valor.ndim == 0 else valor
+    return resultados
 
-print("=" * 62)
 
 # ─── Figura 4×3 ───────────────────────────────────────────
-nomes = list(materiais.keys())
-fig   = plt.figure(figsize=(16, 14))
-fig.suptitle(
-    f'Correntes de Foucault — Comparação de Materiais (f = {f:.0f} Hz, B₀ = {B0*1000:.0f} mT)',
-    fontsize=14, fontweight='bold'
-)
-gs = gridspec.GridSpec(4, 3, figure=fig, hspace=0.48, wspace=0.35,
-                       left=0.07, right=0.97, top=0.94, bottom=0.06)
-
-for col, nome in enumerate(nomes):
-    r   = resultados[nome]
-    cor = r["cor"]
-
-    # ── Linha 0: Densidade de corrente ────────────────────
-    ax = fig.add_subplot(gs[0, col])
-    im = ax.imshow(r["J_mag"].T, origin='lower', aspect='equal',
-                   extent=[0, Lx*100, 0, Ly*100], cmap='inferno')
-    cb = plt.colorbar(im, ax=ax, pad=0.02)
-    cb.set_label('|J| [MA/m²]', fontsize=8)
-    strm = ax.streamplot(xg, yg, r["snap_Jx"].T, r["snap_Jy"].T,
-                         color='white', linewidth=0.5, density=1.2, arrowsize=0.7)
-    strm.lines.set_alpha(0.45)
-    ax.set_title(f'{nome}\n|J| máx = {r["J_max"]:.4f} MA/m²', fontsize=10, color=cor)
-    ax.set_xlabel('x [cm]', fontsize=8)
-    ax.set_ylabel('y [cm]', fontsize=8)
-
-    # ── Linha 1: Perdas Joule ─────────────────────────────
-    ax2 = fig.add_subplot(gs[1, col])
-    im2 = ax2.imshow((r["losses_avg"]/1e3).T, origin='lower', aspect='equal',
-                     extent=[0, Lx*100, 0, Ly*100], cmap='hot')
-    cb2 = plt.colorbar(im2, ax=ax2, pad=0.02)
-    cb2.set_label('P [kW/m³]', fontsize=8)
-    ax2.set_title(f'P total = {r["P_total"]*1000:.3f} mW', fontsize=10)
-    ax2.set_xlabel('x [cm]', fontsize=8)
-    ax2.set_ylabel('y [cm]', fontsize=8)
-
-# ── Linha 2: Perfil de atenuação Bz — todos juntos ────────
-ax3 = fig.add_subplot(gs[2, :])
-B_teo_al  = B0 * np.exp(-x / resultados["Alumínio"]["delta"]) * 1000
-B_teo_cu  = B0 * np.exp(-x / resultados["Cobre"]["delta"])    * 1000
-B_teo_fe  = B0 * np.exp(-x / resultados["Ferro"]["delta"])    * 1000
-
-for nome, B_teo in zip(nomes, [B_teo_al, B_teo_cu, B_teo_fe]):
-    r   = resultados[nome]
-    cor = r["cor"]
-    ax3.plot(x*100, B_teo, color=cor, lw=1.8, linestyle='--', alpha=0.7)
-    ax3.plot(x*100, r["Bz_perfil"], color=cor, lw=2.2,
-             label=f'{nome}  (δ={r["delta"]*1000:.1f} mm)')
-    ax3.axvline(r["delta"]*100, color=cor, lw=1.0, linestyle=':', alpha=0.6)
-
-ax3.axhline(B0*np.exp(-1)*1000, color='gray', lw=1.0, linestyle=':',
-            label=f'B₀/e = {B0*np.exp(-1)*1000:.1f} mT')
-ax3.set_title(r'Perfil de Atenuação de $B_z$ — Simulado (linha sólida) vs Teórico (tracejado)',
-              fontsize=11)
-ax3.set_xlabel('x [cm]', fontsize=10)
-ax3.set_ylabel('|Bz| [mT]', fontsize=10)
-ax3.legend(fontsize=9)
-ax3.grid(True, alpha=0.3)
-ax3.set_xlim(0, Lx*100)
-ax3.set_ylim(bottom=0)
-
-# ── Linha 3: Evolução temporal — todos juntos ──────────────
-ax4 = fig.add_subplot(gs[3, :])
-t_arr = np.linspace(0, 2/f, 500)
-B_ext_t = B0 * np.sin(omega * t_arr)
-ax4.plot(t_arr*1000, B_ext_t*1000, color='gray', lw=2.0,
-         linestyle='--', label='Campo externo $B_{ext}$', alpha=0.7)
-
-for nome in nomes:
-    r   = resultados[nome]
-    cor = r["cor"]
-    pen = Lx / 4
-    att = np.exp(-pen / r["delta"])
-    B_int = B0 * att * np.sin(omega * t_arr - pen / r["delta"])
-    defasagem_graus = np.degrees(r["phi_lag"])
-    ax4.plot(t_arr*1000, B_int*1000, color=cor, lw=2.2,
-             label=f'{nome}  (Δφ={defasagem_graus:.1f}°, att={att:.3f})')
-    ax4.fill_between(t_arr*1000, B_int*1000, alpha=0.08, color=cor)
-
-ax4.set_title(r'Evolução Temporal — Defasagem e Atenuação por Material (x = 3.75 cm)',
-              fontsize=11)
-ax4.set_xlabel('t [ms]', fontsize=10)
-ax4.set_ylabel('B [mT]', fontsize=10)
-ax4.legend(fontsize=9)
-ax4.grid(True, alpha=0.3)
-ax4.set_xlim(0, t_arr[-1]*1000)
-
-plt.savefig('foucault_comparacao_materiais.png', dpi=180, bbox_inches='tight')
-plt.show()
+def figura(resultados, dpi=100, interativo=False):
+    """Figura comparativa salva em PNG; abre uma janela só se `interativo`."""
+    # O backend só é carregado aqui: execuções sem figura não pagam por ele
+    import matplotlib
+    if not interativo:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.gridspec as gridspec
+
+    nomes = list(materiais.keys())
+    fig   = plt.figure(figsize=(16, 14))
+    fig.suptitle(
+        f'Correntes de Foucault — Comparação de Materiais (f = {f:.0f} Hz, B₀ = {B0*1000:.0f} mT)',
+        fontsize=14, fontweight='bold'
+    )
+    gs = gridspec.GridSpec(4, 3, figure=fig, hspace=0.48, wspace=0.35,
+                           left=0.07, right=0.97, top=0.94, bottom=0.06)
+
+    for col, nome in enumerate(nomes):
+        r   = resultados[nome]
+        cor = r["cor"]
+
+        # ── Linha 0: Densidade de corrente ────────────────────
+        ax = fig.add_subplot(gs[0, col])
+        im = ax.imshow(r["J_mag"].T, origin='lower', aspect='equal',
+                       extent=[0, Lx*100, 0, Ly*100], cmap='inferno')
+        cb = plt.colorbar(im, ax=ax, pad=0.02)
+        cb.set_label('|J| [MA/m²]', fontsize=8)
+        k = 6   # uma seta a cada 6 células (streamplot integra linhas em Python puro)
+        if r["J_max"] > 0:     # campo nulo: o quiver não tem escala
+            ax.quiver(xg[::k], yg[::k], r["snap_Jx"][::k, ::k].T, r["snap_Jy"][::k, ::k].T,
+                      color='white', alpha=0.6, width=0.003, pivot='mid')
+        ax.set_title(f'{nome}\n|J| máx = {r["J_max"]:.4f} MA/m²', fontsize=10, color=cor)
+        ax.set_xlabel('x [cm]', fontsize=8)
+        ax.set_ylabel('y [cm]', fontsize=8)
+
+        # ── Linha 1: Perdas Joule ─────────────────────────────
+        ax2 = fig.add_subplot(gs[1, col])
+        im2 = ax2.imshow((r["losses_avg"]/1e3).T, origin='lower', aspect='equal',
+                         extent=[0, Lx*100, 0, Ly*100], cmap='hot')
+        cb2 = plt.colorbar(im2, ax=ax2, pad=0.02)
+        cb2.set_label('P [kW/m³]', fontsize=8)
+        ax2.set_title(f'P total = {r["P_total"]*1000:.3f} mW', fontsize=10)
+        ax2.set_xlabel('x [cm]', fontsize=8)
+        ax2.set_ylabel('y [cm]', fontsize=8)
+
+    # ── Linha 2: Perfil de atenuação Bz — todos juntos ────
+    ax3 = fig.add_subplot(gs[2, :])
+    B_teo_al  = B0 * np.exp(-x / resultados["Alumínio"]["delta"]) * 1000
+    B_teo_cu  = B0 * np.exp(-x / resultados["Cobre"]["delta"])    * 1000
+    B_teo_fe  = B0 * np.exp(-x / resultados["Ferro"]["delta"])    * 1000
+
+    for nome, B_teo in zip(nomes, [B_teo_al, B_teo_cu, B_teo_fe]):
+        r   = resultados[nome]
+        cor = r["cor"]
+        ax3.plot(x*100, B_teo, color=cor, lw=1.8, linestyle='--', alpha=0.7)
+        ax3.plot(x*100, r["Bz_perfil"], color=cor, lw=2.2,
+                 label=f'{nome}  (δ={r["delta"]*1000:.1f} mm)')
+        ax3.axvline(r["delta"]*100, color=cor, lw=1.0, linestyle=':', alpha=0.6)
+
+    ax3.axhline(B0*np.exp(-1)*1000, color='gray', lw=1.0, linestyle=':',
+                label=f'B₀/e = {B0*np.exp(-1)*1000:.1f} mT')
+    ax3.set_title(r'Perfil de Atenuação de $B_z$ — Simulado (linha sólida) vs Teórico (tracejado)',
+                  fontsize=11)
+    ax3.set_xlabel('x [cm]', fontsize=10)
+    ax3.set_ylabel('|Bz| [mT]', fontsize=10)
+    ax3.legend(fontsize=9)
+    ax3.grid(True, alpha=0.3)
+    ax3.set_xlim(0, Lx*100)
+    ax3.set_ylim(bottom=0)
+
+    # ── Linha 3: Evolução temporal — todos juntos ──────────
+    ax4 = fig.add_subplot(gs[3, :])
+    t_arr = np.linspace(0, 2/f, 500)
+    B_ext_t = B0 * np.sin(omega * t_arr)
+    ax4.plot(t_arr*1000, B_ext_t*1000, color='gray', lw=2.0,
+             linestyle='--', label='Campo externo $B_{ext}$', alpha=0.7)
+
+    for nome in nomes:
+        r   = resultados[nome]
+        cor = r["cor"]
+        pen = Lx / 4
+        att = np.exp(-pen / r["delta"])
+        B_int = B0 * att * np.sin(omega * t_arr - pen / r["delta"])
+        defasagem_graus = np.degrees(r["phi_lag"])
+        ax4.plot(t_arr*1000, B_int*1000, color=cor, lw=2.2,
+                 label=f'{nome}  (Δφ={defasagem_graus:.1f}°, att={att:.3f})')
+        ax4.fill_between(t_arr*1000, B_int*1000, alpha=0.08, color=cor)
+
+    ax4.set_title(r'Evolução Temporal — Defasagem e Atenuação por Material (x = 3.75 cm)',
+                  fontsize=11)
+    ax4.set_xlabel('t [ms]', fontsize=10)
+    ax4.set_ylabel('B [mT]', fontsize=10)
+    ax4.legend(fontsize=9)
+    ax4.grid(True, alpha=0.3)
+    ax4.set_xlim(0, t_arr[-1]*1000)
+
+    plt.savefig('foucault_comparacao_materiais.png', dpi=dpi, bbox_inches='tight')
+    if interativo:
+        plt.show()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Correntes de Foucault — comparação de materiais")
+    parser.add_argument("--plot", action="store_true",
+                        help="gera foucault_comparacao_materiais.png")
+    parser.add_argument("--interactive", action="store_true",
+                        help="também abre a figura numa janela (implica --plot)")
+    parser.add_argument("--dpi", type=int, default=100,
+                        help="resolução do PNG (padrão: 100)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="simula de novo mesmo se houver resultados em cache")
+    args = parser.parse_args()
+
+    if METODO not in METODOS:
+        raise SystemExit(f"METODO = {METODO!r} inválido; use um de: {', '.join(METODOS)}")
+    if GPU and not HAS_CUPY:
+        raise SystemExit("GPU = True requer o pacote cupy")
+
+    # A simulação é determinística: com os mesmos parâmetros, reusa o cache
+    cache = caminho_cache()
+    if not args.no_cache and os.path.exists(cache):
+        resultados = carrega_cache(cache)
+        print(f"  ✓ resultados lidos de {cache}")
+    else:
+        # Os materiais são independentes. No explícito com Numba (ou o kernel
+        # AOT) rodam todos num só kernel, uma thread por material; com um só
+        # material `integra_explicito` paraleliza os blocos de `passo`. Nos
+        # demais casos, um processo por material. Na GPU usa threads (CUDA não
+        # sobrevive a fork), um stream por material.
+        lote = (HAS_NUMBA or _integra_lote_aot) and METODO == "explicito" and not GPU
+        if lote and len(materiais) > 1:
+            resultados = simular_lote(materiais)
+        else:
+            resultados = {}
+            Executor   = ThreadPoolExecutor if GPU else ProcessPoolExecutor
+            with Executor(max_workers=len(materiais)) as ex:
+                for nome, res in zip(materiais, ex.map(simular, materiais.keys(), materiais.values())):
+                    resultados[nome] = res
+        # Simulação instável (inf/nan) não vai para o cache
+        if finitos(resultados):
+            salva_cache(cache, resultados)
+        else:
+            print("  ! resultados não finitos; cache não gravado")
+
+    # ─── CLI ──────────────────────────────────────────────
+    print("\n" + "=" * 62)
+    print("  COMPARAÇÃO DE MATERIAIS — CORRENTES DE FOUCAULT (60 Hz)")
+    print("=" * 62)
+    hdr = f"  {'Grandeza':<28} " + " ".join(f"{nome:>10}" for nome in materiais)
+    print(hdr)
+    print("  " + "-" * 60)
+
+    linhas = [
+        ("Condutividade [S/m]",  "sigma",   "{:.2e}"),
+        ("Permeabilidade (μᵣ)",  "mu_r",    "{:.0f}"),
+        ("Skin depth δ [mm]",    "delta",   "{:.2f}",   1000),
+        ("Defasagem [ms]",       "lag_ms",  "{:.3f}"),
+        ("Defasagem [°]",        "phi_lag", "{:.1f}",   180/np.pi),
+        ("|J| máximo [kA/m²]",  "J_max",   "{:.2f}",   1e3),
+        ("|J| médio [kA/m²]",   "J_mean",  "{:.2f}",   1e3),
+        ("Razão pico/média",     None,      "{:.2f}"),
+        ("P máxima [kW/m³]",    "P_max",   "{:.4f}",   1e-3),
+        ("P média [kW/m³]",     "P_mean",  "{:.4f}",   1e-3),
+        ("P total [mW]",         "P_total", "{:.4f}",   1e3),
+    ]
+
+    cols = [resultados[nome] for nome in materiais]
+    for label, key, fmt, *scale in linhas:
+        scale = scale[0] if scale else 1.0
+        if key is None:
+            vals = [fmt.format(c["J_max"] / c["J_mean"]) if c["J_mean"] > 0 else "—"
+                    for c in cols]
+        else:
+            vals = [fmt.format(c[key] * scale) for c in cols]
+        print(f"  {label:<28} " + " ".join(f"{v:>10}" for v in vals))
+
+    print("=" * 62)
+
+    if args.plot or args.interactive:
+        figura(resultados, args.dpi, args.interactive)